@@ -1,11 +1,201 @@
+import os
+import re
+import hashlib
+import tempfile
+import warnings
 import numpy as np
+from pathlib import Path
+from functools import lru_cache, wraps
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from aux import eng_string
+import aerosandbox.geometry.airfoil.airfoil as _asb_airfoil
 from aerosandbox.geometry.airfoil import Airfoil
-import aerosandbox.numpy as np
+from aerosandbox.geometry.airfoil.airfoil_families import (
+    get_NACA_coordinates,
+    get_UIUC_coordinates,
+    get_file_coordinates,
+)
 
 # Modify some methods from the Airfoil class from AeroSandbox library.
 
 
+# Names that AeroSandbox parses as NACA 4-series airfoils: 4 digits right after the first "naca"
+_NACA_RE = re.compile(r"^(?:(?!naca).)*naca\d{4}(?:naca.*)?$", re.IGNORECASE | re.DOTALL)
+
+# Parsed .dat coordinates are also cached on disk as .npy files, which load much faster
+_COORDINATES_CACHE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME", Path.home() / ".cache"))
+    / "airfoils_toolkit"
+    / "coordinates"
+)
+
+
+# Coordinate lookups are memoized, since the same airfoil is often built many times (sweeps,
+# optimization loops, plotting). The cached lookups replace the ones used by the AeroSandbox
+# Airfoil constructor, and return copies so that the cached arrays are never modified.
+@lru_cache(maxsize=None)
+def _naca(name):
+    return get_NACA_coordinates(name=name)
+
+
+@lru_cache(maxsize=None)
+def _uiuc(name):
+    return get_UIUC_coordinates(name=name)
+
+
+def _coordinates_cache_path(filepath: Path) -> Path:
+    # One cache file per .dat file, named after its absolute path so that files with the same
+    # name in different directories don't collide.
+    digest = hashlib.sha1(str(filepath.resolve()).encode()).hexdigest()[:16]
+    return _COORDINATES_CACHE_DIR / f"{filepath.name}.{digest}.coords.npy"
+
+
+def _load_coords_cached(filepath):
+    # The .npy cache is ignored if it is older than the .dat file, unreadable or not Nx2.
+    filepath = Path(filepath)
+    npy_path = _coordinates_cache_path(filepath)
+    if npy_path.exists() and npy_path.stat().st_mtime_ns >= filepath.stat().st_mtime_ns:
+        try:
+            coordinates = np.load(npy_path)
+            if coordinates.ndim == 2 and coordinates.shape[1] == 2:
+                return coordinates
+        except (OSError, ValueError, EOFError):
+            pass
+
+    coordinates = get_file_coordinates(filepath=filepath).astype(np.float32)
+
+    # Written to a temporary file first and then moved into place, so that concurrent readers
+    # never see a partially written cache.
+    tmp_path = None
+    try:
+        npy_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=npy_path.parent, suffix=".npy.tmp")
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, coordinates)
+        os.replace(tmp_path, npy_path)
+    except OSError:  # e.g. read-only cache directory, just skip the cache
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return coordinates
+
+
+@lru_cache(maxsize=256)
+def _file(filepath, mtime_ns):
+    # The modification time is part of the cache key, so a .dat file rewritten in place is
+    # parsed again instead of returning its old coordinates.
+    return _load_coords_cached(filepath)
+
+
+def _cached_NACA_coordinates(name=None, **kwargs):
+    if kwargs or not isinstance(name, str):
+        return get_NACA_coordinates(name=name, **kwargs)
+    # Other names are rejected here, so that the common UIUC case skips AeroSandbox's NACA parsing
+    if not _NACA_RE.match(name.strip()):
+        raise ValueError("Not a NACA 4-series airfoil name.")
+    return _naca(name).copy()
+
+
+def _cached_UIUC_coordinates(name="dae11"):
+    return _uiuc(name).copy()
+
+
+def _cached_file_coordinates(filepath):
+    # Anything but a path (e.g. arrays, which AeroSandbox handles by catching the TypeError)
+    # goes straight to AeroSandbox.
+    if not isinstance(filepath, (str, os.PathLike)):
+        return get_file_coordinates(filepath=filepath)
+    # Like AeroSandbox, falls back to the path with a .dat extension appended
+    for path in (os.fspath(filepath), f"{os.fspath(filepath)}.dat"):
+        if os.path.isfile(path):
+            return _file(path, os.stat(path).st_mtime_ns).copy()
+    return get_file_coordinates(filepath=filepath)
+
+
+# Plotting backends are imported on first use only, so that e.g. plotly is never imported
+# when only matplotlib is used.
+_plt = None
+_go = None
+_pretty_plots = None
+_polar_fig = None
+
+# Matplotlib settings for fast rendering: aggressive path simplification and chunked Agg
+# rendering. Barely visible on smooth curves such as airfoils.
+_FAST_RC = {
+    "path.simplify": True,
+    "path.simplify_threshold": 1.0,
+    "agg.path.chunksize": 10000,
+}
+
+
+def _get_plt():
+    global _plt
+    if _plt is None:
+        import matplotlib.pyplot as plt
+
+        _plt = plt
+    return _plt
+
+
+def _get_go():
+    global _go
+    if _go is None:
+        import plotly.graph_objects as go
+
+        _go = go
+    return _go
+
+
+def _get_pretty_plots():
+    global _pretty_plots
+    if _pretty_plots is None:
+        import aerosandbox.tools.pretty_plots as p
+
+        _pretty_plots = p
+    return _pretty_plots
+
+
+def fast_rendering():
+    """
+    Context manager that renders matplotlib figures with the fast settings used by
+    `draw(fast=True)`. Simplification and chunking apply when a figure is rendered, so wrap the
+    `savefig`/`show` calls with it, e.g. when saving a whole airfoil catalog:
+
+        with fast_rendering():
+            for airfoil in airfoils:
+                airfoil.draw(backend="matplotlib", show=False, fast=True)
+                plt.savefig(f"{airfoil.name}.png")
+                plt.close()
+    """
+    return _get_plt().rc_context(_FAST_RC)
+
+
+def _canonicalize(coordinates: np.ndarray) -> np.ndarray:
+    # Removes consecutive duplicated points (e.g. a repeated trailing edge point in some
+    # .dat files), which otherwise show up as zero-length panels downstream.
+    if len(coordinates) == 0:
+        return coordinates
+    keep = np.concatenate(([True], np.any(np.diff(coordinates, axis=0) != 0, axis=1)))
+    return np.ascontiguousarray(coordinates[keep])
+
+
+_asb_init = Airfoil.__init__
+
+
+@wraps(_asb_init)
+def __init__(self, *args, **kwargs) -> None:
+    _asb_init(self, *args, **kwargs)
+
+    # Numeric coordinates are stored once as a C-contiguous float32 array with consecutive
+    # duplicated points removed, whatever the input was (file, list, view). Duplicates are
+    # removed after the cast, so points that only differ below float32 precision are merged too.
+    # Other types, such as CasADi symbols in an optimization, are kept as they are.
+    if isinstance(self.coordinates, np.ndarray) and self.coordinates.dtype.kind in "fiu":
+        self.coordinates = _canonicalize(
+            np.ascontiguousarray(self.coordinates, dtype=np.float32)
+        )
+
+
 def draw(
     self,
     fig=None,
@@ -15,6 +205,7 @@ def draw(
     color="blue",
     fill=True,
     show=True,
+    fast=False,
 ) -> None:
     """
     Draw the airfoil object.
@@ -24,34 +215,37 @@ def draw(
         draw_mcl: Should we draw the mean camber line (MCL)? [boolean]
         backend: Which backend should we use? "plotly" or "matplotlib"
         show: Should we show the plot? [boolean]
+        fast: Should we trade some rendering fidelity for speed? Matplotlib only. Applies to
+            the rendering done by `show`; with show=False, render inside `fast_rendering()`. [boolean]
 
     Returns: None
     """
-    x = np.reshape(np.array(self.x()), -1)
-    y = np.reshape(np.array(self.y()), -1)
+    x, y = self.x(), self.y()
     if draw_mcl:
         x_mcl = np.linspace(np.min(x), np.max(x), len(x))
         y_mcl = self.local_camber(x_mcl)
 
     if backend == "matplotlib":
-        import matplotlib.pyplot as plt
-        import aerosandbox.tools.pretty_plots as p
+        plt = _get_plt()
+        p = _get_pretty_plots()
 
         color = "#280887"
-        plt.plot(x, y, ".-" if draw_markers else "-", zorder=11, color=color)
-        plt.fill(x, y, zorder=10, color=color, alpha=0.2)
-        if draw_mcl:
-            plt.plot(x_mcl, y_mcl, "-", zorder=4, color=color, alpha=0.4)
-        plt.axis("equal")
-        if show:
-            p.show_plot(
-                title=f"{self.name} Airfoil",
-                xlabel=r"$x/c$",
-                ylabel=r"$y/c$",
-            )
+        # The settings only apply inside the context, so global rcParams are left untouched
+        with plt.rc_context(_FAST_RC if fast else {}):
+            plt.plot(x, y, ".-" if draw_markers else "-", zorder=11, color=color)
+            plt.fill(x, y, zorder=10, color=color, alpha=0.2)
+            if draw_mcl:
+                plt.plot(x_mcl, y_mcl, "-", zorder=4, color=color, alpha=0.4)
+            plt.axis("equal")
+            if show:
+                p.show_plot(
+                    title=f"{self.name} Airfoil",
+                    xlabel=r"$x/c$",
+                    ylabel=r"$y/c$",
+                )
 
     elif backend == "plotly":
-        import plotly.graph_objects as go
+        go = _get_go()
 
         if fig is None:
             fig = go.Figure()
@@ -89,6 +283,96 @@ def draw(
             return fig
 
 
+def coordinates_f64(self) -> np.ndarray:
+    """
+    The airfoil coordinates as a float64 array, for consumers that need double precision.
+    """
+    if isinstance(self.coordinates, np.ndarray):
+        return self.coordinates.astype(np.float64)
+    return self.coordinates
+
+
+def write_dat(
+    self,
+    filepath=None,
+    include_name: bool = True,
+) -> str:
+    """
+    Writes a .dat file corresponding to this airfoil to a filepath.
+
+    Args:
+        filepath: Filepath (including the filename and .dat extension) to write to (optional)
+        include_name: Should the name of the airfoil be included in the .dat file? [boolean]
+
+    Returns: The contents of the .dat file, as a string.
+    """
+    # Formatting the rows from plain Python floats measured faster than both np.savetxt and
+    # np.char.mod, from a few hundred up to 10k points.
+    contents = [self.name] if include_name else []
+    contents += ["%f %f" % (x, y) for x, y in self.coordinates.tolist()]
+    string = "\n".join(contents)
+
+    if filepath is not None:
+        with open(filepath, "w+") as f:
+            f.write(string)
+
+    return string
+
+
+def _unique_workdir(working_directory, i):
+    # Each run needs its own directory, otherwise the XFOIL files of concurrent runs collide.
+    if working_directory is None:
+        return None
+    workdir = Path(working_directory) / f"Re_{i}"
+    workdir.mkdir(parents=True, exist_ok=True)
+    return workdir
+
+
+def _to_polar_array(run_data: dict, alpha_grid: np.ndarray, tolerance: float) -> np.ndarray:
+    # Reindexes an XFOIL run onto `alpha_grid` as (alpha, CL, CD, CM) rows; missing points are NaN.
+    # Each point goes to the nearest grid alpha (within `tolerance`), so the grid may be in any order.
+    polar = np.full((len(alpha_grid), 4), np.nan)
+    polar[:, 0] = alpha_grid
+    if len(alpha_grid) == 0:
+        return polar
+
+    distances = np.abs(alpha_grid[np.newaxis, :] - run_data["alpha"][:, np.newaxis])
+    indices = np.argmin(distances, axis=1)
+    on_grid = distances[np.arange(len(indices)), indices] < tolerance
+
+    polar[indices[on_grid], 1] = run_data["CL"][on_grid]
+    polar[indices[on_grid], 2] = run_data["CD"][on_grid]
+    polar[indices[on_grid], 3] = run_data["CM"][on_grid]
+
+    return polar
+
+
+def polars(self) -> list:
+    """
+    Polar data as a list of dicts (one per Reynolds number), as returned by `run_xfoil`: "alpha",
+    "CL", "CD", "CDp", "CM", "Top_Xtr", "Bot_Xtr" and "Re" arrays of the converged points.
+    """
+    return self._polar_runs
+
+
+def _set_polars(self, value: list) -> None:
+    # Assigning the list of dicts also rebuilds `polars_array`, on the grid of all the alphas found,
+    # and `Res`. Every assigned run is considered converged.
+    self._polar_runs = list(value)
+    self.Res = np.array(
+        [run["Re"][0] if len(run["Re"]) > 0 else np.nan for run in self._polar_runs]
+    )
+    self.converged = np.ones(len(self._polar_runs), dtype=bool)
+    if len(self._polar_runs) == 0:
+        self.polars_array = np.empty((0, 0, 4))
+        return
+
+    alpha_grid = np.unique(np.concatenate([run["alpha"] for run in self._polar_runs]))
+    self.polars_array = np.stack(
+        [_to_polar_array(run, alpha_grid, 1e-9) for run in self._polar_runs]
+    )
+
+
 def generate_polars(
     self,
     alpha_i: float = 0.0,
@@ -98,12 +382,20 @@ def generate_polars(
     n_iter: int = 100,
     min_points_to_converged: int = 20,
     working_directory: str = None,
+    max_workers: int = os.cpu_count(),
+    batch: bool = False,
 ) -> dict:
     """
     Generates polar data for the airfoil using XFOIL over a specified range of angles of attack.
 
     This method utilizes the `run_xfoil` function to perform simulations and retrieve polar data,
     which includes lift, drag, and moment coefficients for the airfoil at various angles of attack.
+    Each Reynolds number is an independent XFOIL process, so the runs are dispatched concurrently.
+
+    The results are stored in `polars_array`, with shape (N_Re, N_alpha, 4) for (alpha, CL, CD, CM)
+    on the requested alpha grid, where points that did not converge are NaN. Reynolds numbers with
+    fewer than `min_points_to_converged` converged points are discarded with a warning, and the
+    boolean mask `converged` tells which of the requested `Res` were kept.
 
     Args:
         alpha_i (float): Initial angle of attack in degrees. Defaults to 0.0.
@@ -112,75 +404,221 @@ def generate_polars(
         Re (int): Reynolds number for the simulation. Defaults to 1000000.
         n_iter (int): Maximum number of iterations for convergence. Defaults to 100.
         min_points_to_converged (int): Minimum number of points required for convergence. Defaults to 20.
-        working_directory (str, optional): Directory to use for temporary files. Defaults to None.
+        working_directory (str, optional): Directory to use for temporary files. Defaults to None,
+            in which case a temporary directory is used (under /dev/shm when available).
+        max_workers (int, optional): Maximum number of concurrent XFOIL runs. Runs serially if 1.
+            Defaults to the number of CPUs.
+        batch (bool, optional): Run all Reynolds numbers in a single XFOIL process, loading and
+            paneling the airfoil only once. Ignores `max_workers`. Defaults to False.
 
     Returns:
         dict: Dictionary containing the polar data from the XFOIL simulation.
+
+    Raises:
+        ValueError: If `alpha_step` is zero or doesn't go from `alpha_i` towards `alpha_f`.
+        FileNotFoundError: If an XFOIL run didn't write its polar output file.
     """
 
-    from xfoil import run_xfoil
+    from xfoil import run_xfoil, run_xfoil_batch, _scratch_directory
     from tqdm import tqdm
 
-    # Get a list of dicts, where each dict is the result of an XFoil run at a particular Re.
-    run_datas = [
-        run_xfoil(self, alpha_i, alpha_f, alpha_step, Re, n_iter, working_directory)
-        for Re in tqdm(
-            Res,
-            desc=f"Running XFoil to generate polars for Airfoil '{self.name}':",
+    # XFOIL accepts downward sweeps (negative step), but the step must lead from alpha_i to alpha_f
+    if alpha_step == 0 or (alpha_f - alpha_i) * alpha_step < 0:
+        raise ValueError(
+            f"`alpha_step` ({alpha_step}) must be nonzero and go from `alpha_i` ({alpha_i}) "
+            f"towards `alpha_f` ({alpha_f})."
         )
+
+    desc = f"Running XFoil to generate polars for Airfoil '{self.name}':"
+
+    # Unless a working directory is given, all runs share a scratch directory (in RAM on Linux)
+    # that is removed once they are done.
+    with (
+        _scratch_directory() if working_directory is None else nullcontext(working_directory)
+    ) as working_directory:
+        # The airfoil .dat file is written once and loaded by every run
+        Path(working_directory).mkdir(parents=True, exist_ok=True)
+        airfoil_dat_path = Path(working_directory).resolve() / "airfoil.dat"
+        self.write_dat(airfoil_dat_path)
+
+        # Get a list of dicts, where each dict is the result of an XFoil run at a particular Re.
+        if batch:
+            run_datas = run_xfoil_batch(
+                self,
+                alpha_i,
+                alpha_f,
+                alpha_step,
+                Res,
+                n_iter,
+                working_directory,
+                airfoil_dat_path,
+            )
+        elif max_workers == 1:
+            run_datas = [
+                run_xfoil(
+                    self,
+                    alpha_i,
+                    alpha_f,
+                    alpha_step,
+                    Re,
+                    n_iter,
+                    _unique_workdir(working_directory, i),
+                    airfoil_dat_path,
+                )
+                for i, Re in enumerate(tqdm(Res, desc=desc))
+            ]
+        else:
+            # XFOIL runs as an external process, so threads are enough to run it concurrently.
+            run_datas = [None] * len(Res)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    executor.submit(
+                        run_xfoil,
+                        self,
+                        alpha_i,
+                        alpha_f,
+                        alpha_step,
+                        Re,
+                        n_iter,
+                        _unique_workdir(working_directory, i),
+                        airfoil_dat_path,
+                    ): i
+                    for i, Re in enumerate(Res)
+                }
+                # Completions arrive in bursts, so the progress bar redraws are throttled
+                with tqdm(total=len(Res), desc=desc, mininterval=0.5) as pbar:
+                    for future in as_completed(futures):
+                        run_datas[futures[future]] = future.result()
+                        pbar.update(1)
+
+    # Align every run on the requested alpha grid, padding non-converged points with NaN
+    alpha_grid = np.arange(alpha_i, alpha_f + alpha_step / 2, alpha_step)
+    polars_array = np.stack(
+        [
+            _to_polar_array(run_data, alpha_grid, abs(alpha_step) / 2)
+            for run_data in run_datas
+        ]
+    )
+
+    # Discards the Reynolds numbers with too few converged points; `converged` keeps track of
+    # which of the requested `Res` were kept.
+    self.converged = (
+        np.count_nonzero(~np.isnan(polars_array[:, :, 1]), axis=1)
+        >= min_points_to_converged
+    )
+    self.polars_array = polars_array[self.converged]
+    self._polar_runs = [
+        run_data for run_data, converged in zip(run_datas, self.converged) if converged
     ]
+    self.Res = np.asarray(Res)[self.converged]
 
-    self.polars = run_datas
-    self.Res = Res
+    if not np.any(self.converged):
+        warnings.warn(
+            f"XFOIL didn't converge on {min_points_to_converged} points at any Reynolds number "
+            f"for Airfoil '{self.name}'.",
+            stacklevel=2,
+        )
+    elif not np.all(self.converged):
+        warnings.warn(
+            f"XFOIL didn't converge on {min_points_to_converged} points for Airfoil '{self.name}' at "
+            f"Re = {', '.join(eng_string(Re) for Re in np.asarray(Res)[~self.converged])}, "
+            "which were discarded.",
+            stacklevel=2,
+        )
 
     return self.polars
 
-    # """Descarta os perfis que não convergirem"""
-    # try:
-    #     alpha = polar_data[:, 0]
-    #     if len(alpha) < min_points_to_converged:
-    #         self.converged = False
-    #     else:
-    #         Cl = polar_data[:, 1]
-    #         Cd = polar_data[:, 2]
-    #         self.converged = (
-    #             True  # Estado que determina se o perfil convergiu na análise
-    #         )
+
+def _finite_segments(x: np.ndarray, y: np.ndarray) -> list:
+    # Splits a curve into its runs of finite points, so that gaps (e.g. non-converged points)
+    # are left open instead of being bridged by a straight line.
+    finite = np.isfinite(x) & np.isfinite(y)
+    breaks = np.flatnonzero(np.diff(finite)) + 1
+    return [
+        segment
+        for segment, is_finite in zip(
+            np.split(np.column_stack([x, y]), breaks), np.split(finite, breaks)
+        )
+        if is_finite[0]
+    ]
+
+
+def _get_polar_fig():
+    # Returns the (fig, ax) shared by `plot_polars(inplace=True)` calls, cleared for reuse.
+    global _polar_fig
+    plt = _get_plt()
+    if _polar_fig is None or not plt.fignum_exists(_polar_fig[0].number):
+        _polar_fig = plt.subplots(2, 2, figsize=(9, 8))
+    else:
+        for axis in _polar_fig[1].ravel():
+            axis.cla()
+    return _polar_fig
 
 
 def plot_polars(
     self,
+    inplace: bool = False,
 ) -> None:
-    import matplotlib.pyplot as plt
-
-    fig, ax = plt.subplots(2, 2, figsize=(9, 8))
-    for data in self.polars:
-        ax[0, 0].plot(data["alpha"], data["CL"])
-        ax[0, 0].set(
-            xlabel=r"Angle of Attack $\alpha$ [deg]",
-            ylabel="Lift Coefficient $C_L$",
-        )
-
-        ax[0, 1].plot(data["alpha"], data["CD"])
-        ax[0, 1].set(
-            xlabel=r"Angle of Attack $\alpha$ [deg]",
-            ylabel="Drag Coefficient $C_D$",
-        )
+    """
+    Plot the polars generated by `generate_polars`.
 
-        ax[1, 0].plot(data["alpha"], data["CM"])
-        ax[1, 0].set(
-            xlabel=r"Angle of Attack $\alpha$ [deg]",
-            ylabel="Moment Coefficient $C_m$",
-        )
+    Args:
+        inplace: Should we reuse (and clear) a shared figure instead of creating a new one?
+            Faster when plotting many airfoils in a row, but not thread-safe. [boolean]
 
-        ax[1, 1].plot(data["CL"], data["CD"])
-        ax[1, 1].set(
-            xlabel=r"Angle of Attack $\alpha$ [deg]",
-            ylabel=r"Lift-to-Drag Ratio $C_L/C_D$",
-        )
+    Returns: None
+    """
+    plt = _get_plt()
+
+    from matplotlib.collections import LineCollection
+    from matplotlib.lines import Line2D
+
+    if inplace:
+        fig, ax = _get_polar_fig()
+    else:
+        fig, ax = plt.subplots(2, 2, figsize=(9, 8))
+
+    # One color per Reynolds number, following the default color cycle
+    cycle = plt.rcParams["axes.prop_cycle"].by_key()["color"]
+    colors = [cycle[i % len(cycle)] for i in range(len(self.polars_array))]
+
+    alpha, CL, CD, CM = np.moveaxis(self.polars_array, -1, 0)
+
+    # Lift-to-drag ratio, left undefined (NaN) where CD vanishes
+    LD = np.divide(CL, CD, out=np.full_like(CL, np.nan), where=CD > 1e-12)
+
+    # Each subplot gets all Reynolds numbers as a single collection
+    for axis, Y in zip(ax.ravel(), [CL, CD, CM, LD]):
+        segments = []
+        segment_colors = []
+        for a, y, color in zip(alpha, Y, colors):
+            curve_segments = _finite_segments(a, y)
+            segments += curve_segments
+            segment_colors += [color] * len(curve_segments)
+        axis.add_collection(LineCollection(segments, colors=segment_colors))
+        axis.autoscale()
+
+    ax[0, 0].set(
+        xlabel=r"Angle of Attack $\alpha$ [deg]",
+        ylabel="Lift Coefficient $C_L$",
+    )
+    ax[0, 1].set(
+        xlabel=r"Angle of Attack $\alpha$ [deg]",
+        ylabel="Drag Coefficient $C_D$",
+    )
+    ax[1, 0].set(
+        xlabel=r"Angle of Attack $\alpha$ [deg]",
+        ylabel="Moment Coefficient $C_m$",
+    )
+    ax[1, 1].set(
+        xlabel=r"Angle of Attack $\alpha$ [deg]",
+        ylabel=r"Lift-to-Drag Ratio $C_L/C_D$",
+    )
 
     plt.sca(ax[0, 0])
     plt.legend(
+        # Collections have a single legend entry, so each Re gets a proxy line
+        handles=[Line2D([], [], color=color) for color in colors],
         title="Reynolds Number",
         labels=[eng_string(Re) for Re in self.Res],
         ncol=2,
@@ -224,10 +662,23 @@ def plot_polars(
     # )
 
 
+_asb_airfoil.get_NACA_coordinates = _cached_NACA_coordinates
+_asb_airfoil.get_UIUC_coordinates = _cached_UIUC_coordinates
+_asb_airfoil.get_file_coordinates = _cached_file_coordinates
+Airfoil.__init__ = __init__
 Airfoil.draw = draw
+Airfoil.coordinates_f64 = property(coordinates_f64)
+Airfoil.write_dat = write_dat
+Airfoil.polars = property(polars, _set_polars)
 Airfoil.generate_polars = generate_polars
 Airfoil.plot_polars = plot_polars
 
 if __name__ == "__main__":
     airfoil = Airfoil("NACA0012")
+
+    # Array coordinates, as used by e.g. `repanel`, are not taken for a file path
+    array_airfoil = Airfoil("array", coordinates=airfoil.coordinates)
+    assert np.array_equal(array_airfoil.coordinates, airfoil.coordinates)
+    assert len(airfoil.repanel().coordinates) > 0
+
     airfoil.generate_polars()
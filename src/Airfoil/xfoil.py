@@ -6,6 +6,106 @@ import subprocess
 import numpy as np
 from aerosandbox import Airfoil
 from pathlib import Path
+from contextlib import nullcontext
+
+
+# On Linux, /dev/shm is a RAM-backed tmpfs, so XFOIL's input and polar files never touch the
+# disk. Elsewhere, the default temporary directory is used.
+_SCRATCH_ROOT = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+def _scratch_directory() -> tempfile.TemporaryDirectory:
+    return tempfile.TemporaryDirectory(
+        prefix=f"airfoil_toolkit_{os.getpid()}_", dir=_SCRATCH_ROOT
+    )
+
+
+def _get_xfoil_bin() -> str:
+    # Selects binaries based on OS
+    if sys.platform.startswith("win32"):
+        return str(Path(__file__).resolve().parents[1] / "XFOIL_BIN" / "xfoil.exe")
+    elif sys.platform.startswith("darwin"):
+        return "xfoil"
+    elif sys.platform.startswith("linux"):
+        return "xfoil"
+    else:
+        raise RuntimeError("Unsupported operating system for XFOIL execution.")
+
+
+def _execute_xfoil(input_file_path: Path, directory: Path) -> None:
+    XFOIL_BIN = _get_xfoil_bin()
+
+    # Run XFOIL inside the working directory, so that its scratch files (e.g. ":00.bl")
+    # don't collide with other XFOIL runs happening at the same time.
+    try:
+        subprocess.run(
+            f"{XFOIL_BIN} < {input_file_path}",
+            shell=True,
+            check=True,
+            cwd=directory,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+    except subprocess.CalledProcessError as e:
+        if e.returncode == 11:
+            raise Exception(
+                "XFoil segmentation-faulted. This is likely because your input airfoil has too many points.\n"
+            )
+        elif e.returncode == 8 or e.returncode == 136:
+            raise Exception(
+                "XFoil returned a floating point exception. This is probably because you are trying to start\n"
+                "your analysis at an operating point where the viscous boundary layer can't be initialized based\n"
+                "on the computed inviscid flow. (You're probably hitting a Goldstein singularity.) Try starting\n"
+                "your XFoil run at a less-aggressive (alpha closer to 0, higher Re) operating point."
+            )
+        else:
+            raise e
+
+    scratch_file_path = directory / ":00.bl"
+    if scratch_file_path.exists():
+        os.remove(scratch_file_path)
+
+
+def _read_polar(output_file_path: Path, Re: float) -> dict:
+    if not os.path.exists(output_file_path) or os.path.getsize(output_file_path) == 0:
+        raise FileNotFoundError("Polar output file not found or is empty.")
+
+    # Parse the polar
+    regex = re.compile("(?:\s*([+-]?\d*.\d*))")
+
+    with open(output_file_path) as f:
+        lines = f.readlines()
+
+        alpha = []
+        cl = []
+        cd = []
+        cdp = []
+        cm = []
+        xtr_top = []
+        xtr_bottom = []
+
+        for line in lines[12:]:
+            linedata = regex.findall(line)
+            alpha.append(float(linedata[0]))
+            cl.append(float(linedata[1]))
+            cd.append(float(linedata[2]))
+            cdp.append(float(linedata[3]))
+            cm.append(float(linedata[4]))
+            xtr_top.append(float(linedata[5]))
+            xtr_bottom.append(float(linedata[6]))
+
+        output = {
+            "alpha": np.array(alpha),
+            "CL": np.array(cl),
+            "CD": np.array(cd),
+            "CDp": np.array(cdp),
+            "CM": np.array(cm),
+            "Top_Xtr": np.array(xtr_top),
+            "Bot_Xtr": np.array(xtr_bottom),
+            "Re": Re * np.ones_like(np.array(alpha)),
+        }
+
+    return output
 
 
 def run_xfoil(
@@ -16,6 +116,7 @@ def run_xfoil(
     Re: int = 200000,
     n_iter: int = 100,
     working_directory: str = None,
+    airfoil_dat_path: str = None,
 ) -> np.ndarray:
     """
     Runs an XFOIL simulation for a given airfoil over a specified range of angles of attack.
@@ -32,6 +133,8 @@ def run_xfoil(
         Re (int): Reynolds number for the simulation. Defaults to 200000.
         n_iter (int): Maximum number of iterations for convergence. Defaults to 100.
         working_directory (str, optional): Directory to use for temporary files. Defaults to None.
+        airfoil_dat_path (str, optional): Existing .dat file of the airfoil to load, instead of
+            writing one from the airfoil object. Defaults to None.
 
     Returns:
         np.ndarray: Array containing the polar data from the XFOIL simulation.
@@ -42,29 +145,21 @@ def run_xfoil(
         RuntimeError: If there is an error reading the polar data.
     """
 
-    # Selects binaries based on OS
-    if sys.platform.startswith("win32"):
-        XFOIL_BIN = "./XFOIL_BIN/xfoil.exe"
-    elif sys.platform.startswith("darwin"):
-        XFOIL_BIN = "xfoil"
-    elif sys.platform.startswith("linux"):
-        XFOIL_BIN = "xfoil"
-    else:
-        raise RuntimeError("Unsupported operating system for XFOIL execution.")
-
-    with tempfile.TemporaryDirectory() as directory:
-        directory = Path(directory)
-
-        # Alternatively, work in another directory for debugging:
-        if working_directory is not None:
-            directory = Path(working_directory)
+    # Unless a working directory is given (e.g. for debugging), a scratch directory is used and
+    # removed afterwards.
+    with (
+        _scratch_directory() if working_directory is None else nullcontext(working_directory)
+    ) as directory:
+        directory = Path(directory).resolve()
 
         input_file_path = directory / "input.in"
         output_file_path = directory / "output.txt"
-        airfoil_dat_path = directory / f"airfoil.dat"
-
-        # Generate airfoil .dat file from object
-        airfoil.write_dat(airfoil_dat_path)
+        # Generate airfoil .dat file from object, unless one is already given
+        if airfoil_dat_path is None:
+            airfoil_dat_path = directory / f"airfoil.dat"
+            airfoil.write_dat(airfoil_dat_path)
+        else:
+            airfoil_dat_path = Path(airfoil_dat_path).resolve()
 
         # Generate input file for xfoil
         with open(input_file_path, "w") as file:
@@ -80,73 +175,90 @@ def run_xfoil(
             file.write("\n\n")
             file.write("quit\n")
 
-        # Run XFOIL
-        try:
-            subprocess.run(
-                f"{XFOIL_BIN} < {input_file_path}",
-                shell=True,
-                check=True,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-            )
-        except subprocess.CalledProcessError as e:
-            if e.returncode == 11:
-                raise Exception(
-                    "XFoil segmentation-faulted. This is likely because your input airfoil has too many points.\n"
-                )
-            elif e.returncode == 8 or e.returncode == 136:
-                raise Exception(
-                    "XFoil returned a floating point exception. This is probably because you are trying to start\n"
-                    "your analysis at an operating point where the viscous boundary layer can't be initialized based\n"
-                    "on the computed inviscid flow. (You're probably hitting a Goldstein singularity.) Try starting\n"
-                    "your XFoil run at a less-aggressive (alpha closer to 0, higher Re) operating point."
-                )
-            else:
-                raise e
-        if (
-            not os.path.exists(output_file_path)
-            or os.path.getsize(output_file_path) == 0
-        ):
-            raise FileNotFoundError("Polar output file not found or is empty.")
-
-        # Parse the polar
-        regex = re.compile("(?:\s*([+-]?\d*.\d*))")
-
-        with open(output_file_path) as f:
-            lines = f.readlines()
-
-            alpha = []
-            cl = []
-            cd = []
-            cdp = []
-            cm = []
-            xtr_top = []
-            xtr_bottom = []
-
-            for line in lines[12:]:
-                linedata = regex.findall(line)
-                alpha.append(float(linedata[0]))
-                cl.append(float(linedata[1]))
-                cd.append(float(linedata[2]))
-                cdp.append(float(linedata[3]))
-                cm.append(float(linedata[4]))
-                xtr_top.append(float(linedata[5]))
-                xtr_bottom.append(float(linedata[6]))
-
-            output = {
-                "alpha": np.array(alpha),
-                "CL": np.array(cl),
-                "CD": np.array(cd),
-                "CDp": np.array(cdp),
-                "CM": np.array(cm),
-                "Top_Xtr": np.array(xtr_top),
-                "Bot_Xtr": np.array(xtr_bottom),
-                "Re": Re * np.ones_like(np.array(alpha)),
-            }
-
-            os.remove("./:00.bl")
-
-            return output
+        _execute_xfoil(input_file_path, directory)
+
+        return _read_polar(output_file_path, Re)
+
+
+def run_xfoil_batch(
+    airfoil: Airfoil,
+    alpha_i: float = 0.0,
+    alpha_f: float = 10.0,
+    alpha_step: float = 0.25,
+    Res: np.ndarray = np.array([200000]),
+    n_iter: int = 100,
+    working_directory: str = None,
+    airfoil_dat_path: str = None,
+) -> list:
+    """
+    Runs XFOIL simulations for a given airfoil at several Reynolds numbers in a single XFOIL process.
+
+    The airfoil geometry is loaded and paneled only once, and then an angle of attack sweep is
+    accumulated into a separate polar file for each Reynolds number.
+
+    Args:
+        airfoil (Airfoil): The airfoil object containing the airfoil name and coordinates.
+        alpha_i (float): Initial angle of attack in degrees. Defaults to 0.0.
+        alpha_f (float): Final angle of attack in degrees. Defaults to 10.0.
+        alpha_step (float): Step size for the angle of attack in degrees. Defaults to 0.25.
+        Res (np.ndarray): Reynolds numbers for the simulations. Defaults to [200000].
+        n_iter (int): Maximum number of iterations for convergence. Defaults to 100.
+        working_directory (str, optional): Directory to use for temporary files. Defaults to None.
+        airfoil_dat_path (str, optional): Existing .dat file of the airfoil to load, instead of
+            writing one from the airfoil object. Defaults to None.
+
+    Returns:
+        list: List of dicts containing the polar data of each Reynolds number, in the order of `Res`.
+
+    Raises:
+        RuntimeError: If the operating system is unsupported or if XFOIL execution fails.
+        FileNotFoundError: If a polar output file is not found or is empty.
+    """
+
+    # Unless a working directory is given (e.g. for debugging), a scratch directory is used and
+    # removed afterwards.
+    with (
+        _scratch_directory() if working_directory is None else nullcontext(working_directory)
+    ) as directory:
+        directory = Path(directory).resolve()
+
+        input_file_path = directory / "input.in"
+        output_file_paths = [directory / f"polar_{i}.txt" for i in range(len(Res))]
+        # Generate airfoil .dat file from object, unless one is already given
+        if airfoil_dat_path is None:
+            airfoil_dat_path = directory / f"airfoil.dat"
+            airfoil.write_dat(airfoil_dat_path)
+        else:
+            airfoil_dat_path = Path(airfoil_dat_path).resolve()
+
+        # Generate input file for xfoil
+        with open(input_file_path, "w") as file:
+            file.write(f"LOAD {airfoil_dat_path}\n")
+            file.write(airfoil.name + "\n")
+            file.write("PANE\n")
+            file.write("OPER\n")
+            file.write(f"Visc {Res[0]}\n")
+            file.write(f"ITER {n_iter}\n")
+            for i, (Re, output_file_path) in enumerate(zip(Res, output_file_paths)):
+                # Changes Re without leaving viscous mode
+                file.write(f"Re {Re}\n")
+                if i > 0:
+                    # INIT toggles the boundary layer initialization flag, which the previous
+                    # sweep left set, so the sweep at the new Re starts from fresh boundary layers
+                    file.write("INIT\n")
+                file.write("PACC\n")
+                file.write(f"{output_file_path}\n\n")
+                file.write(f"ASeq {alpha_i} {alpha_f} {alpha_step}\n")
+                file.write("PACC\n")
+            file.write("\n\n")
+            file.write("quit\n")
+
+        _execute_xfoil(input_file_path, directory)
+
+        return [
+            _read_polar(output_file_path, Re)
+            for Re, output_file_path in zip(Res, output_file_paths)
+        ]
 
 
 if __name__ == "__main__":